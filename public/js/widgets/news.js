@@ -38,9 +38,10 @@ async function fetchNews(retryCount = 0) {
         }
         
         const data = await response.json();
+        const items = data.items || [];
         
-        if (Array.isArray(data) && data.length > 0) {
-            newsHeadlines = data;
+        if (items.length > 0) {
+            newsHeadlines = items;
             console.log(`✓ Loaded ${newsHeadlines.length} headlines from multiple sources`);
             
             // Update display immediately with first headline
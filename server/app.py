@@ -1,12 +1,92 @@
-from flask import Flask, jsonify, Response, request
-from flask_cors import CORS
-import requests
+import time
+
+# Reference point for startup timings (see /startup and --profile-startup)
+BOOT_STARTED = time.perf_counter()
+
+import importlib
 import json
 import os
+import bisect
+import glob
+import math
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
 import threading
+import unicodedata
+import zlib
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
+from urllib.parse import urlsplit
+
+# ===== STARTUP PROFILING =====
+
+IMPORT_TIMINGS = {}  # Module name -> ms spent on first import
+STARTUP_EVENTS = {}  # Event name -> ms since BOOT_STARTED
+FIRST_RESPONSES = {}  # Route -> ms since BOOT_STARTED of first successful response
+
+def ms_since_boot():
+    """Milliseconds since app.py started loading"""
+    return round((time.perf_counter() - BOOT_STARTED) * 1000, 1)
+
+def mark_startup(event):
+    """Record the first time a startup event happens"""
+    STARTUP_EVENTS.setdefault(event, ms_since_boot())
+
+@contextmanager
+def import_timer(name):
+    """Record how long the imports inside the block take"""
+    started = time.perf_counter()
+    yield
+    IMPORT_TIMINGS.setdefault(name, round((time.perf_counter() - started) * 1000, 1))
+
+def timed_import(name):
+    """Import a module by name, recording how long the first load took"""
+    # Always go through import_module: it waits for a load in progress on another thread
+    already_loaded = name in sys.modules
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already_loaded:
+        IMPORT_TIMINGS.setdefault(name, round((time.perf_counter() - started) * 1000, 1))
+    return module
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return getattr(self._module, attr)
+
+
+with import_timer("flask"):
+    from flask import Flask, jsonify, Response, request
+with import_timer("flask_cors"):
+    from flask_cors import CORS
+with import_timer("dotenv"):
+    from dotenv import load_dotenv
+
+# Only needed once a route talks to an external API - loaded by the warm-up thread
+requests = LazyModule("requests")
+
+# Heavy modules used inside route bodies, loaded in the background after the server is listening
+WARMUP_MODULES = [
+    "requests",
+    "xml.etree.ElementTree",
+    "email.utils",
+    "icalendar",
+    "dateutil.rrule",
+    "dateutil.tz",
+]
 
 # Get the project root directory (parent of server/)
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -183,54 +263,297 @@ def news_feed(feed_index):
     except requests.exceptions.RequestException as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/news/all')
-def news_all():
-    """Return all news feeds combined as JSON"""
+# Aggregated headline index settings
+NEWS_PER_SOURCE_LIMIT = 20  # Items read from each feed per refresh
+NEWS_REFRESH_INTERVAL = 5 * 60  # Seconds before feeds are fetched again
+NEWS_INDEX_CAPACITY = 300  # Oldest headlines are dropped beyond this
+NEWS_PAGE_SIZE = 20
+NEWS_MAX_PAGE_SIZE = 100
+
+NEWS_RETRY_INTERVAL = 30  # Seconds before retrying after every feed failed
+
+# Near-duplicate detection: MinHash over character shingles of the normalized title,
+# bucketed with LSH bands so only likely matches are compared. Candidates are
+# confirmed with the exact Jaccard similarity of the shingle sets.
+NEWS_SHINGLE_SIZE = 4
+NEWS_MINHASH_PERMUTATIONS = 32
+NEWS_MINHASH_BANDS = 8
+NEWS_DUPLICATE_THRESHOLD = 0.8  # Place names alone differ by less ("... i Oslo" vs "... i Bergen" is 0.73)
+NEWS_DUPLICATE_WINDOW = 24 * 60 * 60  # Only headlines published this close can be duplicates
+
+MINHASH_PRIME = (1 << 61) - 1
+_minhash_random = random.Random(56)
+MINHASH_PARAMS = [
+    (_minhash_random.randrange(1, MINHASH_PRIME), _minhash_random.randrange(0, MINHASH_PRIME))
+    for _ in range(NEWS_MINHASH_PERMUTATIONS)
+]
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def normalize_title(title):
+    """Lowercase a headline and strip punctuation and extra whitespace"""
+    title = unicodedata.normalize("NFKC", title or "").casefold()
+    return " ".join(re.findall(r"\w+", title))
+
+def normalize_link(link):
+    """Reduce an article URL to host + path + non-tracking query"""
+    parts = urlsplit((link or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = "&".join(sorted(
+        param for param in parts.query.split("&")
+        if param and not param.lower().startswith(TRACKING_PARAMS)
+    ))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+def title_shingles(text):
+    """Hashed character shingles of a normalized title"""
+    padded = f" {text} "
+    return frozenset(
+        zlib.crc32(padded[i:i + NEWS_SHINGLE_SIZE].encode("utf-8"))
+        for i in range(max(1, len(padded) - NEWS_SHINGLE_SIZE + 1))
+    )
+
+def minhash_signature(shingles):
+    """MinHash signature of a set of hashed shingles"""
+    return tuple(
+        min((a * h + b) % MINHASH_PRIME for h in shingles)
+        for a, b in MINHASH_PARAMS
+    )
+
+def parse_pub_date(value):
+    """Parse an RSS pubDate into a Unix timestamp (0 if missing or invalid)"""
+    from email.utils import parsedate_to_datetime
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError, IndexError):
+        return 0
+
+
+class NewsIndex:
+    """Deduplicated headlines from all feeds, kept sorted newest first as items arrive"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.order = []  # Sort keys (-timestamp, seq), newest first
+        self.entries = {}  # seq -> entry
+        self.links = {}  # Normalized link -> seq of the headline it belongs to
+        self.bands = {}  # LSH band key -> set of seqs
+        self.next_seq = 0
+        self.refreshed_at = None  # time.monotonic() of last successful refresh
+        self.attempted_at = None  # time.monotonic() of last refresh attempt
+        self.lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        rows = NEWS_MINHASH_PERMUTATIONS // NEWS_MINHASH_BANDS
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(NEWS_MINHASH_BANDS)]
+
+    def _find_duplicate(self, shingles, signature, timestamp):
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates |= self.bands.get(key, set())
+        for seq in candidates:
+            entry = self.entries[seq]
+            # Recurring headline templates from days apart are different stories
+            if abs(-entry["key"][0] - timestamp) > NEWS_DUPLICATE_WINDOW:
+                continue
+            other = entry["shingles"]
+            if len(shingles & other) / len(shingles | other) >= NEWS_DUPLICATE_THRESHOLD:
+                return seq
+        return None
+
+    def _evict_oldest(self):
+        key = self.order.pop()
+        entry = self.entries.pop(key[1])
+        for link in entry["links"]:
+            self.links.pop(link, None)
+        for band_key in self._band_keys(entry["signature"]):
+            bucket = self.bands.get(band_key)
+            if bucket is not None:
+                bucket.discard(key[1])
+                if not bucket:
+                    del self.bands[band_key]
+
+    def _update(self, seq, item, title):
+        entry = self.entries[seq]
+        old = entry["item"]
+        if old["title"] == item["title"] and old["description"] == item["description"]:
+            return
+        # Replace rather than mutate, pages already handed out keep their copy
+        entry["item"] = {**old, "title": item["title"], "description": item["description"]}
+
+        shingles = title_shingles(title)
+        if shingles == entry["shingles"]:
+            return
+        for band_key in self._band_keys(entry["signature"]):
+            bucket = self.bands.get(band_key)
+            if bucket is not None:
+                bucket.discard(seq)
+                if not bucket:
+                    del self.bands[band_key]
+        entry["shingles"] = shingles
+        entry["signature"] = minhash_signature(shingles)
+        for band_key in self._band_keys(entry["signature"]):
+            self.bands.setdefault(band_key, set()).add(seq)
+
+    def add(self, item):
+        """Insert a headline unless it (or a near-duplicate) is already indexed"""
+        link = normalize_link(item["link"])
+        title = normalize_title(item["title"])
+        if not title:
+            return False
+
+        with self.lock:
+            if link and link in self.links:
+                seq = self.links[link]
+                if self.entries[seq]["item"].get("sourceIndex") == item.get("sourceIndex"):
+                    # Same article from the same feed - pick up edited headlines
+                    self._update(seq, item, title)
+                return False
+
+            timestamp = parse_pub_date(item["pubDate"])
+            shingles = title_shingles(title)
+            signature = minhash_signature(shingles)
+            duplicate = self._find_duplicate(shingles, signature, timestamp)
+            if duplicate is not None:
+                # Remember the link so the same story is skipped cheaply next refresh
+                if link:
+                    self.links[link] = duplicate
+                    self.entries[duplicate]["links"].append(link)
+                return False
+
+            seq = self.next_seq
+            self.next_seq += 1
+            key = (-timestamp, seq)
+            self.entries[seq] = {
+                "item": item,
+                "key": key,
+                "shingles": shingles,
+                "signature": signature,
+                "links": [link] if link else []
+            }
+            if link:
+                self.links[link] = seq
+            for band_key in self._band_keys(signature):
+                self.bands.setdefault(band_key, set()).add(seq)
+            bisect.insort(self.order, key)
+
+            while len(self.order) > self.capacity:
+                self._evict_oldest()
+            return True
+
+    def page(self, limit, cursor=None):
+        """Return (items, next_cursor) starting after cursor"""
+        with self.lock:
+            start = bisect.bisect_right(self.order, cursor) if cursor else 0
+            keys = self.order[start:start + limit]
+            items = [self.entries[key[1]]["item"] for key in keys]
+            has_more = start + limit < len(self.order)
+        next_cursor = f"{keys[-1][0]}_{keys[-1][1]}" if keys and has_more else None
+        return items, next_cursor
+
+
+news_index = NewsIndex(NEWS_INDEX_CAPACITY)
+news_refresh_lock = threading.Lock()
+
+
+def parse_news_cursor(value):
+    """Parse a /news/all cursor back into an index sort key"""
+    try:
+        timestamp, seq = value.split("_")
+        return (int(timestamp), int(seq))
+    except ValueError:
+        return None
+
+def news_index_is_due():
+    """Whether the feeds should be fetched again (with a short backoff after failures)"""
+    now = time.monotonic()
+    if news_index.refreshed_at is not None and now - news_index.refreshed_at < NEWS_REFRESH_INTERVAL:
+        return False
+    if news_index.attempted_at is not None and now - news_index.attempted_at < NEWS_RETRY_INTERVAL:
+        return False
+    return True
+
+def refresh_news_index():
+    """Fetch all feeds into the news index if it is stale"""
     import xml.etree.ElementTree as ET
-    from datetime import datetime
-    
-    all_items = []
-    
-    for i, feed in enumerate(NEWS_FEEDS):
+
+    with news_refresh_lock:
+        # Checked under the lock so a refresh that just finished is not repeated
+        if not news_index_is_due():
+            return
+        news_index.attempted_at = time.monotonic()
+
+        fetched = False
+        for i, feed in enumerate(NEWS_FEEDS):
+            try:
+                r = requests.get(feed["url"], headers={
+                    "User-Agent": "SmartHub-WH56/1.0"
+                }, timeout=10)
+                r.raise_for_status()
+
+                root = ET.fromstring(r.content)
+                items = root.findall('.//item')
+                fetched = True
+
+                for item in items[:NEWS_PER_SOURCE_LIMIT]:
+                    title = item.find('title')
+                    link = item.find('link')
+                    description = item.find('description')
+                    pubDate = item.find('pubDate')
+
+                    news_index.add({
+                        "title": title.text if title is not None else "",
+                        "link": link.text if link is not None else "",
+                        "description": description.text if description is not None else "",
+                        "pubDate": pubDate.text if pubDate is not None else "",
+                        "source": feed["name"],
+                        "sourceColor": feed["color"],
+                        "sourceIndex": i
+                    })
+            except Exception as e:
+                print(f"Error fetching {feed['name']}: {e}")
+                continue
+
+        # Retry after NEWS_RETRY_INTERVAL if every feed failed
+        if fetched:
+            news_index.refreshed_at = time.monotonic()
+
+def news_refreshing():
+    """Keep the news index up to date in the background"""
+    print("📰 News refresher started")
+
+    while True:
         try:
-            r = requests.get(feed["url"], headers={
-                "User-Agent": "SmartHub-WH56/1.0"
-            }, timeout=10)
-            r.raise_for_status()
-            
-            root = ET.fromstring(r.content)
-            items = root.findall('.//item')
-            
-            for item in items[:5]:  # Max 5 per source
-                title = item.find('title')
-                link = item.find('link')
-                description = item.find('description')
-                pubDate = item.find('pubDate')
-                
-                all_items.append({
-                    "title": title.text if title is not None else "",
-                    "link": link.text if link is not None else "",
-                    "description": description.text if description is not None else "",
-                    "pubDate": pubDate.text if pubDate is not None else "",
-                    "source": feed["name"],
-                    "sourceColor": feed["color"],
-                    "sourceIndex": i
-                })
+            refresh_news_index()
         except Exception as e:
-            print(f"Error fetching {feed['name']}: {e}")
-            continue
-    
-    # Sort by date (newest first)
-    def parse_date(item):
-        try:
-            from email.utils import parsedate_to_datetime
-            return parsedate_to_datetime(item["pubDate"])
-        except:
-            return datetime.min
-    
-    all_items.sort(key=parse_date, reverse=True)
-    
-    return jsonify(all_items)
+            print(f"News refresh error: {e}")
+        time.sleep(NEWS_RETRY_INTERVAL)
+
+@app.route('/news/all')
+def news_all():
+    """Return deduplicated headlines from all feeds, newest first (?limit=20&cursor=...)"""
+    limit = max(1, min(request.args.get("limit", NEWS_PAGE_SIZE, type=int), NEWS_MAX_PAGE_SIZE))
+    cursor = None
+    if request.args.get("cursor"):
+        cursor = parse_news_cursor(request.args["cursor"])
+        if cursor is None:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    # Normally filled in by the background refresher; right after startup the
+    # first request fetches itself (or waits for the fetch already running)
+    if news_index.refreshed_at is None:
+        refresh_news_index()
+    items, next_cursor = news_index.page(limit, cursor)
+
+    return jsonify({
+        "items": items,
+        "next_cursor": next_cursor
+    })
 
 
 @app.route('/stocks')
@@ -511,29 +834,297 @@ def wifi_credentials():
 
 # ===== RASPBERRY PI SYSTEM INFO =====
 
+THERMAL_ZONE_FILE = '/sys/class/thermal/thermal_zone0/temp'
+# Firmware throttling flags (path differs between Pi models), vcgencmd as fallback
+THROTTLED_FILES = glob.glob('/sys/devices/platform/soc*/*firmware/get_throttled')
+VCGENCMD = shutil.which("vcgencmd")
+
+TELEMETRY_INTERVAL = 10  # Seconds between samples
+TELEMETRY_CAPACITY = 24 * 60 * 60 // TELEMETRY_INTERVAL  # 24 hours of history
+TELEMETRY_POINTS = 120  # Default number of points in /system history
+TELEMETRY_MAX_POINTS = 720
+TELEMETRY_FIELDS = ("temperature", "load", "memory", "throttled", "rss")
+
+# Use synthetic values when not running on a Pi (development)
+TELEMETRY_SOURCE = "pi" if os.path.exists(THERMAL_ZONE_FILE) else "synthetic"
+
+# get_throttled bits: current state in the low bits, "has occurred" from bit 16
+THROTTLE_FLAGS = {
+    "under_voltage": 0,
+    "freq_capped": 1,
+    "throttled": 2,
+    "soft_temp_limit": 3,
+}
+
+
+class TelemetryRing:
+    """Fixed-size ring buffer of telemetry samples backed by flat float arrays"""
+
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = fields
+        self.times = array('d', [0.0]) * capacity
+        self.values = {name: array('d', [0.0]) * capacity for name in fields}
+        self.head = 0  # Next write position
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, sample):
+        """Store a sample, overwriting the oldest one when full"""
+        with self.lock:
+            self.times[self.head] = timestamp
+            for name in self.fields:
+                self.values[name][self.head] = sample[name]
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def latest(self):
+        """Return the newest sample as a dict, or None if empty"""
+        with self.lock:
+            if not self.count:
+                return None
+            i = (self.head - 1) % self.capacity
+            sample = {name: self.values[name][i] for name in self.fields}
+            sample["time"] = self.times[i]
+            return sample
+
+    def since(self, cutoff):
+        """Return (timestamp, values) rows newer than cutoff, oldest first"""
+        rows = []
+        with self.lock:
+            i = self.head
+            for _ in range(self.count):
+                i = (i - 1) % self.capacity
+                if self.times[i] < cutoff:
+                    break
+                rows.append((self.times[i], [self.values[name][i] for name in self.fields]))
+        rows.reverse()
+        return rows
+
+
+telemetry = TelemetryRing(TELEMETRY_CAPACITY, TELEMETRY_FIELDS)
+
+
+def read_throttled():
+    """Read firmware throttling flags (0 when unavailable)"""
+    try:
+        if THROTTLED_FILES:
+            with open(THROTTLED_FILES[0], 'r') as f:
+                return int(f.read().strip(), 16)
+        if VCGENCMD:
+            # Output looks like "throttled=0x50000" (empty without access to the video group)
+            out = subprocess.run([VCGENCMD, "get_throttled"], capture_output=True, text=True, timeout=2)
+            return int(out.stdout.strip().split("=")[-1], 16)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        pass
+    return 0
+
+def read_memory_percent():
+    """Read used memory in percent from /proc/meminfo"""
+    meminfo = {}
+    with open('/proc/meminfo', 'r') as f:
+        for line in f:
+            key, value = line.split(":", 1)
+            meminfo[key] = int(value.split()[0])
+    total = meminfo["MemTotal"]
+    return (total - meminfo["MemAvailable"]) / total * 100
+
+def read_rss_mb():
+    """Read resident memory of this process in MB"""
+    with open('/proc/self/statm', 'r') as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+def read_load():
+    """Read the 1 minute load average"""
+    return os.getloadavg()[0]
+
+def read_optional(reader):
+    """Run an auxiliary reader, returning NaN instead of failing the whole sample"""
+    try:
+        return reader()
+    except (OSError, ValueError, KeyError, IndexError, ZeroDivisionError):
+        return math.nan
+
+def read_pi_sample():
+    """Read one telemetry sample from the Raspberry Pi"""
+    with open(THERMAL_ZONE_FILE, 'r') as f:
+        # Temperature is in millidegrees Celsius
+        temp_celsius = float(f.read().strip()) / 1000.0
+    return {
+        "temperature": temp_celsius,
+        "load": read_optional(read_load),
+        "memory": read_optional(read_memory_percent),
+        "throttled": read_throttled(),
+        "rss": read_optional(read_rss_mb),
+    }
+
+def read_synthetic_sample(now):
+    """Fake the Pi-specific readings on non-RPi systems (development), keep the real ones"""
+    return {
+        "temperature": 42.0 + 3.0 * math.sin(now / 600.0),
+        "load": read_optional(read_load),
+        "memory": read_optional(read_memory_percent),
+        "throttled": 0,
+        "rss": read_optional(read_rss_mb),
+    }
+
+def record_telemetry_sample():
+    """Take one sample from the active source and store it"""
+    now = time.time()
+    if TELEMETRY_SOURCE == "pi":
+        sample = read_pi_sample()
+    else:
+        sample = read_synthetic_sample(now)
+    telemetry.append(now, sample)
+
+def latest_telemetry():
+    """Return the newest sample, sampling on demand if the sampler has not run yet"""
+    sample = telemetry.latest()
+    if sample is None:
+        record_telemetry_sample()
+        sample = telemetry.latest()
+    return sample
+
+def telemetry_sampling():
+    """Sample system telemetry at a fixed cadence"""
+    print(f"📈 Telemetry sampler started ({TELEMETRY_SOURCE}, every {TELEMETRY_INTERVAL}s)")
+    next_run = time.monotonic()
+
+    while True:
+        try:
+            record_telemetry_sample()
+        except Exception as e:
+            print(f"Telemetry sampling error: {e}")
+
+        next_run += TELEMETRY_INTERVAL
+        delay = next_run - time.monotonic()
+        if delay < 0:
+            # Fell behind (e.g. system suspended) - resync instead of catching up
+            next_run = time.monotonic()
+            delay = 0
+        time.sleep(delay)
+
+def parse_window(value):
+    """Parse a window like "90s", "15m", "1h" or "24h" into seconds"""
+    match = re.fullmatch(r"(\d+)([smh]?)", value.strip().lower())
+    if not match:
+        return None
+    seconds = int(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    if seconds <= 0 or seconds > TELEMETRY_CAPACITY * TELEMETRY_INTERVAL:
+        return None
+    return seconds
+
+def decode_throttled(flags):
+    """Split get_throttled flags into current and since-boot booleans"""
+    flags = int(flags)
+    return {
+        "now": {name: bool(flags & (1 << bit)) for name, bit in THROTTLE_FLAGS.items()},
+        "occurred": {name: bool(flags & (1 << (bit + 16))) for name, bit in THROTTLE_FLAGS.items()},
+    }
+
+def round_reading(value, digits):
+    """Round a reading for JSON output (None if it could not be read)"""
+    return None if math.isnan(value) else round(value, digits)
+
+def format_telemetry(timestamp, values):
+    """Round a sample for JSON output"""
+    return {
+        "time": datetime.fromtimestamp(timestamp).isoformat(timespec='seconds'),
+        "temperature": round_reading(values["temperature"], 1),
+        "load": round_reading(values["load"], 2),
+        "memory": round_reading(values["memory"], 1),
+        "throttled": int(values["throttled"]),
+        "rss": round_reading(values["rss"], 1),
+    }
+
+def downsample_telemetry(rows, start, end, points):
+    """Average rows into at most `points` time buckets (throttle flags are OR'ed, failed reads skipped)"""
+    throttled_index = TELEMETRY_FIELDS.index("throttled")
+    width = (end - start) / points
+    buckets = {}
+
+    for timestamp, values in rows:
+        index = min(int((timestamp - start) / width), points - 1)
+        bucket = buckets.get(index)
+        if bucket is None:
+            bucket = buckets[index] = [0, 0.0, [0.0] * len(TELEMETRY_FIELDS), [0] * len(TELEMETRY_FIELDS), 0]
+        bucket[0] += 1
+        bucket[1] += timestamp
+        for i, value in enumerate(values):
+            if not math.isnan(value):
+                bucket[2][i] += value
+                bucket[3][i] += 1
+        bucket[4] |= int(values[throttled_index])
+
+    history = []
+    for index in sorted(buckets):
+        count, time_sum, sums, counts, throttled = buckets[index]
+        averaged = {
+            name: sums[i] / counts[i] if counts[i] else math.nan
+            for i, name in enumerate(TELEMETRY_FIELDS)
+        }
+        averaged["throttled"] = throttled
+        history.append(format_telemetry(time_sum / count, averaged))
+    return history
+
+
 @app.route('/temperature')
 def get_temperature():
     """Get Raspberry Pi CPU temperature"""
     try:
-        # Try to read from thermal zone (Raspberry Pi standard location)
-        with open('/sys/class/thermal/thermal_zone0/temp', 'r') as f:
-            temp_str = f.read().strip()
-            # Temperature is in millidegrees Celsius
-            temp_celsius = float(temp_str) / 1000.0
-            return jsonify({
-                "temperature": round(temp_celsius, 1),
-                "unit": "C"
-            })
-    except FileNotFoundError:
-        # Fallback for non-RPi systems (development)
-        return jsonify({
-            "temperature": 42.0,
-            "unit": "C",
-            "mock": True
-        })
+        sample = latest_telemetry()
+        result = {
+            "temperature": round(sample["temperature"], 1),
+            "unit": "C"
+        }
+        if TELEMETRY_SOURCE != "pi":
+            result["mock"] = True
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/system')
+def system_info():
+    """Get current system telemetry and downsampled history (?window=1h&points=120)"""
+    window = parse_window(request.args.get("window", "1h"))
+    if window is None:
+        return jsonify({"error": "Invalid window"}), 400
+    points = max(1, min(request.args.get("points", TELEMETRY_POINTS, type=int), TELEMETRY_MAX_POINTS))
+
+    try:
+        sample = latest_telemetry()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    end = time.time()
+    start = end - window
+    rows = telemetry.since(start)
+
+    temperature_index = TELEMETRY_FIELDS.index("temperature")
+    throttled_index = TELEMETRY_FIELDS.index("throttled")
+    peak_temperature = max((values[temperature_index] for _, values in rows), default=sample["temperature"])
+    throttled_flags = 0
+    for _, values in rows:
+        throttled_flags |= int(values[throttled_index])
+
+    current = format_telemetry(sample["time"], sample)
+    current["throttle_flags"] = decode_throttled(sample["throttled"])
+
+    return jsonify({
+        "source": TELEMETRY_SOURCE,
+        "interval": TELEMETRY_INTERVAL,
+        "window": window,
+        "current": current,
+        "summary": {
+            "samples": len(rows),
+            "peak_temperature": round(peak_temperature, 1),
+            "throttled": throttled_flags,
+            "throttle_flags": decode_throttled(throttled_flags)
+        },
+        "history": downsample_telemetry(rows, start, end, points)
+    })
+
 
 # ===== SHOPPING LIST ENDPOINTS =====
 
@@ -697,13 +1288,93 @@ def telegram_polling():
         except Exception as e:
             print(f"Telegram polling error: {e}")
         
-        import time
         time.sleep(1)
 
 
-if __name__ == "__main__":
-    # Start Telegram bot in background thread
+# ===== STARTUP =====
+
+warmup_done = threading.Event()
+
+@app.after_request
+def record_first_response(response):
+    """Remember when each route first answered successfully"""
+    if response.status_code < 400 and request.url_rule is not None:
+        FIRST_RESPONSES.setdefault(request.url_rule.rule, ms_since_boot())
+    return response
+
+@app.route('/startup')
+def startup_info():
+    """Get import timings and startup milestones"""
+    return jsonify({
+        # Copies, since other threads may add entries while serializing
+        "imports": dict(IMPORT_TIMINGS),
+        "events": dict(STARTUP_EVENTS),
+        "first_responses": dict(FIRST_RESPONSES),
+        "warmup_done": warmup_done.is_set()
+    })
+
+def warm_up_imports():
+    """Load the heavy modules used by route bodies"""
+    for name in WARMUP_MODULES:
+        try:
+            timed_import(name)
+        except ImportError as e:
+            print(f"Warm-up import of {name} failed: {e}")
+    mark_startup("warmup_done")
+    warmup_done.set()
+
+def wait_until_listening(port, timeout=30):
+    """Block until the API server accepts connections on port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def background_startup(port):
+    """Warm up imports once the server is listening, then start the Telegram bot"""
+    if wait_until_listening(port):
+        mark_startup("listening")
+    warm_up_imports()
+
     telegram_thread = threading.Thread(target=telegram_polling, daemon=True)
     telegram_thread.start()
+
+def print_startup_profile():
+    """Print an import-time breakdown (python3 app.py --profile-startup)"""
+    print("Startup profile (ms since app.py started loading)")
+    for event, ms in STARTUP_EVENTS.items():
+        print(f"  {event:<28}{ms:>9.1f} ms")
+    print("\nImports (first load)")
+    for name, ms in sorted(IMPORT_TIMINGS.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {name:<28}{ms:>9.1f} ms")
+    print(f"  {'total':<28}{sum(IMPORT_TIMINGS.values()):>9.1f} ms")
+    print("\nFor a per-module breakdown run: python3 -X importtime app.py --profile-startup")
+
+mark_startup("app_loaded")
+
+
+if __name__ == "__main__":
+    PORT = 5000
+
+    if "--profile-startup" in sys.argv:
+        warm_up_imports()
+        print_startup_profile()
+        sys.exit(0)
+
+    # Warm up heavy imports and start Telegram bot once the server is listening
+    startup_thread = threading.Thread(target=background_startup, args=(PORT,), daemon=True)
+    startup_thread.start()
+
+    # Start news refresher right away so headlines are ready for the first requests
+    news_thread = threading.Thread(target=news_refreshing, daemon=True)
+    news_thread.start()
+
+    # Start system telemetry sampler in background thread
+    telemetry_thread = threading.Thread(target=telemetry_sampling, daemon=True)
+    telemetry_thread.start()
     
-    app.run(host="0.0.0.0", port=5000)
+    app.run(host="0.0.0.0", port=PORT)